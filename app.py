@@ -1,50 +1,167 @@
 """
 ValidaPy Web - Sistema de Contratos Simplificado
 """
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, send_file
+from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, send_file, g
 import os
 import sys
+import threading
+import time
 from datetime import datetime
 import json
 
 # Adiciona o diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Tenta importar os módulos existentes
-try:
-    from database import Database
-    from contrato import Contrato
-    print(" Módulos importados com sucesso!")
-except ImportError as e:
-    print(f" Erro ao importar módulos: {e}")
-    print(" Certifique-se que database.py e contrato.py estão no diretório")
+# O banco (database.py / mysql-connector) e o gerador de contratos só são
+# importados e conectados no primeiro uso, para que o boot do worker não
+# dependa da disponibilidade do MySQL. Cada processo mantém um pool limitado
+# de conexões: cada requisição pega uma (get_conexao) e a devolve no
+# teardown, então o total não depende de como o servidor cria threads.
+DB_POOL_TAMANHO = int(os.environ.get('VALIDAPY_DB_POOL', 4))
+# Segundos que uma requisição espera por uma conexão livre do pool
+DB_POOL_ESPERA = 10
+_pool_livres = []
+_pool_lock = threading.Lock()
+_pool_vagas = threading.BoundedSemaphore(DB_POOL_TAMANHO)
 
-app = Flask(__name__)
-app.secret_key = os.urandom(24)
+# Depois de uma falha de conexão, as requisições seguintes respondem direto
+# com erro por alguns segundos em vez de pagar de novo o timeout do MySQL
+DB_RETRY_SEGUNDOS = 5
+_proxima_tentativa = 0.0
 
-# Inicializa o banco
-try:
-    db = Database()
-    contrato_manager = Contrato(db)
+
+def configurar_pool(tamanho):
+    """Define quantas conexões cada processo pode abrir (antes do primeiro uso)"""
+    global DB_POOL_TAMANHO, _pool_vagas
+    DB_POOL_TAMANHO = tamanho
+    _pool_vagas = threading.BoundedSemaphore(tamanho)
+
+
+def _conexao_viva(db):
+    """Testa a conexão com uma consulta trivial"""
+    try:
+        return bool(db.executar_query("SELECT 1", fetch=True))
+    except Exception:
+        return False
+
+
+def _fechar_conexao(db):
+    """Fecha a conexão sem deixar erro de rede/banco escapar"""
+    fechar = getattr(db, 'fechar_conexao', None) or getattr(db, 'close', None)
+    if fechar is None:
+        return
+    try:
+        fechar()
+    except Exception as e:
+        print(f" Erro ao fechar conexão: {e}")
+
+
+def _abrir_conexao():
+    """Uma tentativa de conexão; retorna (db, contrato_manager) ou None"""
+    global _proxima_tentativa
+    
+    if time.monotonic() < _proxima_tentativa:
+        return None
+    
+    try:
+        from database import Database
+        from contrato import Contrato
+    except ImportError as e:
+        print(f" Erro ao importar módulos: {e}")
+        print(" Certifique-se que database.py e contrato.py estão no diretório")
+        _proxima_tentativa = time.monotonic() + DB_RETRY_SEGUNDOS
+        return None
+    
+    try:
+        db = Database()
+        contrato_manager = Contrato(db)
+    except Exception as e:
+        print(f" Erro ao conectar ao banco: {e}")
+        _proxima_tentativa = time.monotonic() + DB_RETRY_SEGUNDOS
+        return None
+    
     print(" Banco de dados conectado!")
-except Exception as e:
-    print(f" Erro ao conectar ao banco: {e}")
-    db = None
-    contrato_manager = None
+    return db, contrato_manager
+
+
+def _pegar_do_pool():
+    """Conexão livre do pool ou None
+    
+    Toda conexão é testada antes do reuso: o MySQL pode tê-la derrubado
+    (wait_timeout, reinício, falha de rede) a qualquer momento.
+    """
+    while True:
+        with _pool_lock:
+            if not _pool_livres:
+                return None
+            conexao = _pool_livres.pop()
+        
+        if _conexao_viva(conexao[0]):
+            return conexao
+        print(" Conexão com o banco perdida, reconectando...")
+        _fechar_conexao(conexao[0])
+
+
+def get_conexao():
+    """Retorna (db, contrato_manager) da requisição atual
+    
+    Na primeira chamada da requisição pega uma conexão do pool (ou abre uma,
+    com no máximo uma tentativa); ela é devolvida em devolver_conexao().
+    Em caso de falha retorna (None, None).
+    """
+    conexao = g.get('conexao')
+    if conexao is not None:
+        return conexao[0], conexao[1]
+    
+    vagas = _pool_vagas
+    if not vagas.acquire(timeout=DB_POOL_ESPERA):
+        print(f" Pool de conexões esgotado ({DB_POOL_TAMANHO} em uso)")
+        return None, None
+    
+    conexao = _pegar_do_pool() or _abrir_conexao()
+    if conexao is None:
+        vagas.release()
+        return None, None
+    
+    g.conexao = conexao
+    g.conexao_vagas = vagas
+    return conexao[0], conexao[1]
+
+
+def devolver_conexao(exc=None):
+    """Devolve ao pool a conexão da requisição (teardown_appcontext)
+    
+    Se a requisição terminou com exceção a conexão pode estar num estado
+    inválido: ela é fechada em vez de voltar ao pool.
+    """
+    conexao = g.pop('conexao', None)
+    if conexao is None:
+        return
+    
+    if exc is None:
+        with _pool_lock:
+            _pool_livres.append(conexao)
+    else:
+        _fechar_conexao(conexao[0])
+    g.pop('conexao_vagas').release()
+
+
+def get_db():
+    """Retorna a conexão com o banco da requisição atual (ou None)"""
+    return get_conexao()[0]
 
 # =============== APENAS 2 ROTAS ===============
 
-@app.route('/')
 def index():
     """Página inicial/landing page"""
     return render_template('index.html')
 
-@app.route('/dashboard', methods=['GET', 'POST'])
 def dashboard():
     """Dashboard com todas as funcionalidades"""
+    db, contrato_manager = get_conexao()
     if not db or not contrato_manager:
         flash("Erro na conexão com o banco de dados", "error")
-        return render_template('index.html')
+        return render_template('index.html'), 503
     
     # =============== AJAX/API ===============
     # API para dados (usada pelo AJAX)
@@ -207,11 +324,11 @@ def dashboard():
                              all_contratos=contratos[:100])  # Limita para performance
     except Exception as e:
         flash(f"Erro ao carregar dashboard: {e}", "error")
-        return render_template('index.html')
+        return render_template('index.html'), 500
 
-@app.route('/download/<path:numero>')
 def download_pdf(numero):
     """Download do PDF"""
+    db = get_db()
     if not db:
         return "Erro no banco", 500
     
@@ -248,11 +365,93 @@ def format_date(date_obj):
         return date_obj.strftime('%d/%m/%Y')
     return ""
 
-app.jinja_env.filters['currency'] = format_currency
-app.jinja_env.filters['date'] = format_date
+# =============== APPLICATION FACTORY ===============
+def create_app():
+    """Cria e configura a aplicação Flask (sem conectar ao banco)"""
+    app = Flask(__name__)
+    # Em produção o wsgi.py exige VALIDAPY_SECRET_KEY; a chave aleatória
+    # por processo só serve para o servidor de desenvolvimento (python app.py)
+    app.secret_key = os.environ.get('VALIDAPY_SECRET_KEY') or os.urandom(24)
+    
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/dashboard', 'dashboard', dashboard, methods=['GET', 'POST'])
+    app.add_url_rule('/download/<path:numero>', 'download_pdf', download_pdf)
+    app.teardown_appcontext(devolver_conexao)
+    
+    app.jinja_env.filters['currency'] = format_currency
+    app.jinja_env.filters['date'] = format_date
+    
+    return app
+
+app = create_app()
+
+# =============== RELATÓRIO DE STARTUP ===============
+def parse_importtime(saida):
+    """Converte a saída de -X importtime em [(cumulativo_us, proprio_us, nome)]
+    
+    O nome mantém a indentação original, que mostra quem importou quem.
+    """
+    modulos = []
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:'):
+            continue
+        partes = linha[len('import time:'):].split('|')
+        if len(partes) != 3 or not partes[0].strip().isdigit():
+            continue
+        proprio, cumulativo, nome = int(partes[0]), int(partes[1]), partes[2].rstrip()
+        modulos.append((cumulativo, proprio, nome))
+    return modulos
+
+def startup_report(top=15):
+    """Mede o tempo de import do app (estilo python -X importtime)"""
+    import subprocess
+    
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=diretorio, capture_output=True, text=True
+    )
+    
+    modulos = parse_importtime(proc.stderr)
+    
+    print("\n" + "="*60)
+    print(" RELATÓRIO DE STARTUP (import app)")
+    print("="*60)
+    
+    if proc.returncode != 0 or not modulos:
+        print(" Falha ao medir o import:")
+        print(proc.stderr.strip())
+        return proc.returncode or 1
+    
+    total = next((c for c, p, n in modulos if n.strip() == 'app'), max(m[0] for m in modulos))
+    print(f"{'CUMULATIVO (ms)':>16} {'PRÓPRIO (ms)':>13}  MÓDULO")
+    print("-"*60)
+    for cumulativo, proprio, nome in sorted(modulos, reverse=True)[:top]:
+        print(f"{cumulativo / 1000:>16.1f} {proprio / 1000:>13.1f}  {nome}")
+    print("-"*60)
+    print(f" Total: {total / 1000:.1f} ms em {len(modulos)} módulo(s)")
+    
+    carregados = {n.strip() for c, p, n in modulos}
+    for pesado in ('fpdf', 'mysql.connector', 'database'):
+        status = "carregado" if pesado in carregados else "adiado"
+        print(f"   {pesado}: {status}")
+    print("="*60)
+    return 0
 
 # =============== INICIALIZAÇÃO ===============
 if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="ValidaPy Web")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="mostra o tempo de import dos módulos e sai")
+    parser.add_argument('--top', type=int, default=15,
+                        help="quantidade de módulos no relatório de startup")
+    args = parser.parse_args()
+    
+    if args.startup_report:
+        sys.exit(startup_report(args.top))
+    
     print("\n" + "="*60)
     print(" VALIDAPY WEB - Sistema Simplificado")
     print("="*60)
@@ -263,6 +462,7 @@ if __name__ == '__main__':
     
     print("\n Sistema pronto!")
     print(" Acesse: http://localhost:5000")
+    print(" (servidor de desenvolvimento - em produção use: python wsgi.py)")
     print("="*60)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=5000)
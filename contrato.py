@@ -1,7 +1,6 @@
 """
 Módulo de gerenciamento de contratos 
 """
-import fpdf
 import os
 from datetime import datetime, date
 import re
@@ -14,7 +13,7 @@ class Contrato:
         
         # Cria pasta se não existir
         if not os.path.exists(self.pasta_contratos):
-            os.makedirs(self.pasta_contratos)
+            os.makedirs(self.pasta_contratos, exist_ok=True)
             print(f" Pasta '{self.pasta_contratos}' criada")
     
     def gerar_numero_contrato(self):
@@ -184,6 +183,9 @@ class Contrato:
         nome_arquivo = f"{numero_contrato}.pdf"
         caminho_arquivo = os.path.join(self.pasta_contratos, nome_arquivo)
         
+        # Import adiado: só quem gera PDF paga o custo de carregar o fpdf
+        import fpdf
+        
         pdf = fpdf.FPDF()
         pdf.add_page()
         
@@ -0,0 +1,270 @@
+"""
+ValidaPy Web - Teste de carga
+
+Sobe o wsgi.py com 1, 2, 4... workers na mesma máquina e, para cada
+configuração, mede duas fases:
+
+1. só a rota rápida (--path, padrão "/")
+2. a rota rápida junto com clientes numa rota lenta: por padrão um handler
+   simulado que dorme --simular-lento ms (não precisa de MySQL), ou uma rota
+   real com --slow-path (dashboard, download de PDF...)
+
+e mostra a vazão e se a latência da rota rápida se mantém enquanto as rotas
+lentas estão ocupadas.
+
+Uso:
+    python loadtest.py
+    python loadtest.py --workers 1 2 4 8 --threads 4 --clients 32 --duracao 10
+    python loadtest.py --simular-lento 500
+    python loadtest.py --slow-path /dashboard
+    python loadtest.py --slow-path /download/CONTR-20251226-07E938
+    python loadtest.py --slow-clients 0    # só a rota rápida
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROTA_LENTA_SIMULADA = '/_loadtest/lento'
+
+# Sobe o wsgi.py com uma rota extra que dorme N ms, simulando uma consulta
+# ao banco ou um download bloqueante sem precisar de MySQL
+_SERVIDOR_SIMULADO = f"""
+import sys, time
+import wsgi
+
+atraso = float(sys.argv[1]) / 1000
+
+def lento():
+    time.sleep(atraso)
+    return 'ok'
+
+wsgi.app.add_url_rule('{ROTA_LENTA_SIMULADA}', '_loadtest_lento', lento)
+wsgi.main(sys.argv[2:])
+"""
+
+# Latência p95 da rota rápida pode no máximo dobrar sob carga mista
+LIMITE_ESTAVEL = 2.0
+
+# Uma rota "lenta" que responde mais rápido que isso não testa nada
+LENTA_MINIMO_MS = 20
+
+
+def _cliente(host, port, path, duracao):
+    """Faz requisições sequenciais (keep-alive) durante `duracao` segundos"""
+    ok, erros, latencias = 0, 0, []
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    fim = time.perf_counter() + duracao
+
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            resposta = conn.getresponse()
+            resposta.read()
+            # Erros (inclusive a página 503 de banco indisponível) não contam
+            if 200 <= resposta.status < 400:
+                ok += 1
+            else:
+                erros += 1
+        except (OSError, http.client.HTTPException):
+            erros += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        latencias.append(time.perf_counter() - inicio)
+
+    conn.close()
+    return ok, erros, latencias
+
+
+def _porta_ocupada(host, port):
+    """Verifica se já existe algo escutando na porta"""
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+def _aguardar_servidor(servidor, host, port, timeout=30):
+    """Espera o servidor iniciado por nós aceitar conexões"""
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if servidor.poll() is not None:
+            return False
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    return False
+
+
+def _sondar(port, path):
+    """Uma requisição isolada: retorna (status, ms)"""
+    inicio = time.perf_counter()
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        conn.request('GET', path)
+        resposta = conn.getresponse()
+        resposta.read()
+        conn.close()
+        status = resposta.status
+    except (OSError, http.client.HTTPException):
+        status = None
+    return status, (time.perf_counter() - inicio) * 1000
+
+
+def _resumo(resultados, duracao):
+    """Agrega (ok, erros, latências) de vários clientes"""
+    ok = sum(r[0] for r in resultados)
+    erros = sum(r[1] for r in resultados)
+    latencias = sorted(l for r in resultados for l in r[2])
+    p50 = latencias[len(latencias) // 2] * 1000 if latencias else 0
+    p95 = latencias[int(len(latencias) * 0.95)] * 1000 if latencias else 0
+    return {'req_s': ok / duracao, 'erros': erros, 'p50': p50, 'p95': p95}
+
+
+def _fase(port, rotas, duracao):
+    """Roda os clientes de todas as rotas ao mesmo tempo
+
+    `rotas` é uma lista de (path, clientes); retorna um resumo por rota.
+    """
+    total = sum(clientes for _, clientes in rotas)
+    with ProcessPoolExecutor(max_workers=total) as pool:
+        futuros = [[pool.submit(_cliente, '127.0.0.1', port, path, duracao)
+                    for _ in range(clientes)]
+                   for path, clientes in rotas]
+        return [_resumo([f.result() for f in grupo], duracao) for grupo in futuros]
+
+
+def _rota_lenta_valida(port, path):
+    """Confere que a rota lenta responde com sucesso e leva tempo de verdade"""
+    status, ms = _sondar(port, path)
+    if status is None or not 200 <= status < 400:
+        print(f" Rota lenta {path} respondeu {status}: fase mista ignorada")
+        print(" (banco indisponível? use --simular-lento para testar sem MySQL)")
+        return False
+    if ms < LENTA_MINIMO_MS:
+        print(f" AVISO: rota lenta {path} respondeu em {ms:.1f} ms; a fase mista pouco mede")
+    return True
+
+
+def medir(workers, args):
+    """Sobe o servidor com `workers` processos e mede as duas fases"""
+    if _porta_ocupada('127.0.0.1', args.port):
+        print(f" Porta {args.port} já está em uso: use --port com uma porta livre")
+        return None
+
+    opcoes = ['--host', '127.0.0.1', '--port', str(args.port),
+              '--workers', str(workers), '--threads', str(args.threads)]
+    if args.simular_lento:
+        comando = [sys.executable, '-c', _SERVIDOR_SIMULADO, str(args.simular_lento)] + opcoes
+    else:
+        comando = [sys.executable, 'wsgi.py'] + opcoes
+
+    # Chave fixa: todos os workers precisam assinar os cookies igual
+    ambiente = dict(os.environ, VALIDAPY_SECRET_KEY=os.environ.get('VALIDAPY_SECRET_KEY', 'loadtest'))
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    servidor = subprocess.Popen(comando, cwd=diretorio, env=ambiente,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        if not _aguardar_servidor(servidor, '127.0.0.1', args.port):
+            print(f" Servidor com {workers} worker(s) não respondeu (código: {servidor.poll()})")
+            return None
+
+        rapida, = _fase(args.port, [(args.path, args.clients)], args.duracao)
+        resultado = {'workers': workers, 'rapida': rapida}
+
+        if args.slow_clients > 0 and _rota_lenta_valida(args.port, args.slow_path):
+            mista, lenta = _fase(args.port, [(args.path, args.clients),
+                                             (args.slow_path, args.slow_clients)], args.duracao)
+            resultado['mista'] = mista
+            resultado['lenta'] = lenta
+    finally:
+        servidor.terminate()
+        servidor.wait(timeout=30)
+
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Teste de carga do ValidaPy Web")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=16,
+                        help="processos cliente na rota rápida")
+    parser.add_argument('--duracao', type=float, default=10,
+                        help="segundos de carga por fase")
+    parser.add_argument('--path', default='/',
+                        help="rota rápida")
+    parser.add_argument('--slow-path',
+                        help="rota lenta real (consulta ao banco, download de PDF...); "
+                             "sem ela usa o handler simulado")
+    parser.add_argument('--slow-clients', type=int, default=8,
+                        help="processos cliente na rota lenta (0 desliga a fase mista)")
+    parser.add_argument('--simular-lento', type=float, metavar='MS',
+                        help="ms que o handler lento simulado dorme (padrão: 200)")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.slow_path and args.simular_lento:
+        parser.error("use --slow-path ou --simular-lento, não os dois")
+    if not args.slow_path:
+        args.simular_lento = args.simular_lento or 200
+        args.slow_path = ROTA_LENTA_SIMULADA
+
+    print("\n" + "="*78)
+    print(f" TESTE DE CARGA - rápida: GET {args.path} ({args.clients} cliente(s))")
+    if args.slow_clients > 0:
+        descricao = f"{args.simular_lento:.0f}ms simulados" if args.simular_lento else f"GET {args.slow_path}"
+        print(f"                  lenta:  {descricao} ({args.slow_clients} cliente(s))")
+    print(f" {args.duracao:.0f}s por fase, {args.threads} thread(s)/worker")
+    print("="*78)
+
+    resultados = []
+    for workers in args.workers:
+        print(f" Medindo {workers} worker(s)...")
+        r = medir(workers, args)
+        if r:
+            resultados.append(r)
+
+    if not resultados:
+        sys.exit(1)
+
+    base = resultados[0]['rapida']['req_s'] or 1
+    print("\n ROTA RÁPIDA SOZINHA")
+    print(f"{'WORKERS':>8} {'REQ/S':>10} {'ESCALA':>8} {'P50 (ms)':>10} {'P95 (ms)':>10} {'ERROS':>7}")
+    print("-"*78)
+    for r in resultados:
+        rapida = r['rapida']
+        print(f"{r['workers']:>8} {rapida['req_s']:>10.1f} {rapida['req_s'] / base:>7.2f}x "
+              f"{rapida['p50']:>10.1f} {rapida['p95']:>10.1f} {rapida['erros']:>7}")
+
+    mistos = [r for r in resultados if 'mista' in r]
+    if mistos:
+        print("\n CARGA MISTA (rota rápida + rota lenta)")
+        print(f"{'WORKERS':>8} {'RÁPIDA R/S':>11} {'P95 SÓ':>8} {'P95 MISTO':>10} "
+              f"{'LENTA R/S':>10} {'LENTA P95':>10} {'ERROS':>6}  RÁPIDA")
+        print("-"*78)
+        for r in mistos:
+            rapida, mista, lenta = r['rapida'], r['mista'], r['lenta']
+            if lenta['erros']:
+                situacao = 'inválido (rota lenta com erros)'
+            elif mista['p95'] <= max(rapida['p95'], 1) * LIMITE_ESTAVEL:
+                situacao = 'estável'
+            else:
+                situacao = 'degradada'
+            print(f"{r['workers']:>8} {mista['req_s']:>11.1f} {rapida['p95']:>8.1f} {mista['p95']:>10.1f} "
+                  f"{lenta['req_s']:>10.1f} {lenta['p95']:>10.1f} {mista['erros'] + lenta['erros']:>6}  "
+                  f"{situacao}")
+        print(f"\n 'estável': p95 da rota rápida sob carga mista <= {LIMITE_ESTAVEL:.0f}x o p95 sozinha")
+    print("="*78)
@@ -0,0 +1,144 @@
+"""
+Testes da inicialização preguiçosa do app: conexão com o banco (com um
+database.py falso) e relatório de startup
+"""
+import importlib
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+DATABASE_FALSO = '''
+criadas = []
+fechadas = []
+falhar = False
+
+
+class Database:
+    def __init__(self):
+        if falhar:
+            raise ConnectionError("MySQL fora do ar")
+        self.viva = True
+        criadas.append(self)
+
+    def executar_query(self, query, params=None, fetch=False):
+        return [{'1': 1}] if self.viva else None
+
+    def close(self):
+        fechadas.append(self)
+'''
+
+
+@pytest.fixture
+def carregar_app(tmp_path, monkeypatch):
+    """Importa um app novo com o database.py falso no sys.path"""
+    (tmp_path / 'database.py').write_text(textwrap.dedent(DATABASE_FALSO))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.syspath_prepend(RAIZ)
+    monkeypatch.chdir(tmp_path)  # Contrato cria a pasta contratos/ no cwd
+
+    for modulo in ('app', 'database', 'contrato', 'fpdf'):
+        monkeypatch.delitem(sys.modules, modulo, raising=False)
+
+    def _carregar():
+        return importlib.import_module('app')
+
+    return _carregar
+
+
+def test_import_nao_conecta_ao_banco(carregar_app):
+    carregar_app()
+
+    assert 'database' not in sys.modules
+    assert 'contrato' not in sys.modules
+
+
+def test_contrato_nao_importa_fpdf(carregar_app):
+    importlib.import_module('contrato')
+
+    assert 'fpdf' not in sys.modules
+
+
+def test_falha_de_conexao_inicia_backoff(carregar_app, monkeypatch):
+    app = carregar_app()
+    database = importlib.import_module('database')
+    database.falhar = True
+
+    with app.app.test_request_context():
+        assert app.get_conexao() == (None, None)
+    assert app._proxima_tentativa > 0
+
+    # Dentro da janela de backoff nem tenta conectar
+    database.falhar = False
+    with app.app.test_request_context():
+        assert app.get_conexao() == (None, None)
+    assert database.criadas == []
+
+    # Passada a janela, conecta
+    monkeypatch.setattr(app, '_proxima_tentativa', 0.0)
+    with app.app.test_request_context():
+        db, contrato_manager = app.get_conexao()
+    assert db is database.criadas[0]
+    assert contrato_manager is not None
+
+
+def test_conexao_derrubada_e_substituida(carregar_app):
+    app = carregar_app()
+    database = importlib.import_module('database')
+
+    with app.app.test_request_context():
+        primeira, _ = app.get_conexao()
+    with app.app.test_request_context():
+        assert app.get_conexao()[0] is primeira
+
+    # O MySQL derruba a conexão sem o app perceber
+    primeira.viva = False
+    with app.app.test_request_context():
+        segunda, _ = app.get_conexao()
+
+    assert segunda is not primeira
+    assert database.fechadas == [primeira]
+
+
+def test_conexao_volta_ao_pool_no_fim_da_requisicao(carregar_app):
+    app = carregar_app()
+    database = importlib.import_module('database')
+
+    for _ in range(5):
+        with app.app.test_request_context():
+            app.get_conexao()
+
+    assert len(database.criadas) == 1
+    assert len(app._pool_livres) == 1
+
+
+def test_parse_importtime_com_saida_real():
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import json'],
+        capture_output=True, text=True, check=True
+    )
+
+    from app import parse_importtime
+    modulos = parse_importtime(proc.stderr)
+
+    nomes = {nome.strip() for _, _, nome in modulos}
+    assert 'json' in nomes
+    assert all(cumulativo >= proprio >= 0 for cumulativo, proprio, _ in modulos)
+
+
+def test_parse_importtime_ignora_cabecalho_e_lixo():
+    saida = textwrap.dedent('''\
+        import time: self [us] | cumulative | imported package
+        import time:       120 |        120 |   _io
+        outra linha qualquer
+        import time:        80 |        200 | json
+    ''')
+
+    from app import parse_importtime
+
+    assert parse_importtime(saida) == [(120, 120, '   _io'), (200, 80, ' json')]
@@ -0,0 +1,129 @@
+"""
+ValidaPy Web - Entry point de produção (WSGI)
+
+Uso (VALIDAPY_SECRET_KEY é obrigatória):
+    python wsgi.py --workers 4 --threads 8 --port 8000
+    gunicorn -k gthread -w 4 --threads 8 -b 0.0.0.0:8000 wsgi:app
+
+Cada worker é um processo com várias threads: consultas ao banco, geração
+de PDF e download de arquivos bloqueiam só a thread da requisição, não o
+worker inteiro. Isso vale enquanto as operações lentas simultâneas ficarem
+abaixo de workers x threads; acima disso as demais requisições esperam,
+então dimensione --threads para o pico de operações lentas. Os padrões podem vir de variáveis de ambiente
+(VALIDAPY_WORKERS, VALIDAPY_THREADS, VALIDAPY_HOST, VALIDAPY_PORT,
+VALIDAPY_TIMEOUT, VALIDAPY_DB_MAX_CONEXOES).
+
+Cada worker tem um pool de conexões MySQL do tamanho do número de threads
+(via `gunicorn wsgi:app`, use VALIDAPY_DB_POOL), então o app abre até
+workers x threads conexões: mantenha esse número abaixo do max_connections
+do servidor (151 por padrão).
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+from app import app, configurar_pool
+
+SECRET_KEY_AJUDA = ("Defina VALIDAPY_SECRET_KEY (a mesma em todos os workers e máquinas), ex.: "
+                    "export VALIDAPY_SECRET_KEY=$(python -c 'import secrets; print(secrets.token_hex(32))')")
+
+
+def _exigir_secret_key():
+    """Produção exige chave fixa: com chave aleatória por worker/reinício
+    as mensagens flash e sessões se perdem"""
+    if not os.environ.get('VALIDAPY_SECRET_KEY'):
+        raise RuntimeError(SECRET_KEY_AJUDA)
+
+
+# `gunicorn wsgi:app` importa o módulo sem passar pelo main()
+if __name__ != '__main__':
+    _exigir_secret_key()
+
+
+def _env_int(nome, padrao):
+    """Lê um inteiro do ambiente com valor padrão"""
+    try:
+        return int(os.environ.get(nome, padrao))
+    except ValueError:
+        return padrao
+
+
+def run_gunicorn(host, port, workers, threads, timeout):
+    """Sobe o gunicorn com workers gthread (Linux/Mac)"""
+    from gunicorn.app.base import BaseApplication
+
+    class ValidaPyApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{host}:{port}")
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('timeout', timeout)
+            self.cfg.set('accesslog', '-')
+
+        def load(self):
+            return app
+
+    ValidaPyApplication().run()
+
+
+def run_waitress(host, port, workers, threads):
+    """Sobe o waitress (Windows): um processo, workers * threads threads"""
+    from waitress import serve
+
+    if workers > 1:
+        print(f" waitress não usa múltiplos processos: usando {workers * threads} threads")
+    serve(app, host=host, port=port, threads=workers * threads)
+
+
+def main(argv=None):
+    """Lê a configuração (CLI/ambiente) e sobe o servidor"""
+    parser = argparse.ArgumentParser(description="ValidaPy Web - servidor de produção")
+    parser.add_argument('--host', default=os.environ.get('VALIDAPY_HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=_env_int('VALIDAPY_PORT', 8000))
+    parser.add_argument('--workers', type=int,
+                        default=_env_int('VALIDAPY_WORKERS', multiprocessing.cpu_count() * 2 + 1),
+                        help="processos worker (padrão: 2 * CPUs + 1)")
+    parser.add_argument('--threads', type=int, default=_env_int('VALIDAPY_THREADS', 4),
+                        help="threads por worker")
+    parser.add_argument('--timeout', type=int, default=_env_int('VALIDAPY_TIMEOUT', 60),
+                        help="segundos antes de reiniciar um worker travado")
+    parser.add_argument('--max-conexoes', type=int, default=_env_int('VALIDAPY_DB_MAX_CONEXOES', 151),
+                        help="max_connections do MySQL, para avisar se workers x threads passar dele")
+    args = parser.parse_args(argv)
+
+    try:
+        _exigir_secret_key()
+    except RuntimeError as e:
+        print(f" {e}")
+        sys.exit(1)
+
+    print("\n" + "="*60)
+    print(" VALIDAPY WEB - Produção")
+    print(f" {args.host}:{args.port} | {args.workers} worker(s) x {args.threads} thread(s)")
+    # Uma conexão por thread basta: cada requisição usa no máximo uma
+    if sys.platform == 'win32':
+        configurar_pool(args.workers * args.threads)
+    else:
+        configurar_pool(args.threads)
+    conexoes = args.workers * args.threads
+    print(f" Até {conexoes} conexão(ões) MySQL (pool de {args.threads} por worker)")
+    if conexoes > args.max_conexoes:
+        print(f" AVISO: acima do limite de {args.max_conexoes} conexões do MySQL;")
+        print(" reduza --workers/--threads ou aumente max_connections no servidor")
+    print("="*60)
+
+    try:
+        if sys.platform == 'win32':
+            run_waitress(args.host, args.port, args.workers, args.threads)
+        else:
+            run_gunicorn(args.host, args.port, args.workers, args.threads, args.timeout)
+    except ImportError as e:
+        print(f" Servidor de produção não instalado: {e}")
+        print(" Instale com: pip install gunicorn   (Windows: pip install waitress)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()